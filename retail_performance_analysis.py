@@ -7,48 +7,295 @@ Purpose: Comprehensive business analytics and insights generation
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import matplotlib
+matplotlib.use('Agg')  # Charts are only written to PNG files, never shown
 import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import contextlib
+import glob
+import hashlib
+import io
+import os
+import sys
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import scipy.stats as stats
 
 warnings.filterwarnings('ignore')
-plt.style.use('seaborn-v0_8')
+
+# Columns the analyses rely on, with their Arrow types. Only these are read
+# from the CSV, and declaring the types up front lets the multi-threaded
+# reader skip type inference
+COLUMN_TYPES = {
+    'store_id': 'string',
+    'year': 'int16',
+    'month': 'int8',
+    'category': 'string',
+    'sales_amount': 'float64',
+    'gross_margin_pct': 'float32',
+    'net_profit': 'float64',
+    'net_margin_pct': 'float32',
+    'customer_count': 'int32',
+    'avg_basket_value': 'float32',
+    'total_items_sold': 'int32',
+    'inventory_turnover_ratio': 'float32',
+    'customer_satisfaction_score': 'float32',
+    'chain_name': 'string',
+    'region': 'string',
+    'tier': 'string',
+}
+
+# Bump when the preparation in RetailAnalytics._read_csv changes, so Parquet
+# caches written by older code are not reused
+CACHE_VERSION = 1
+
+# Independent analyses run by main(), in report order
+ANALYSES = [
+    'data_quality_check',
+    'financial_analysis',
+    'category_analysis',
+    'regional_analysis',
+    'time_series_analysis',
+    'operational_analysis',
+    'statistical_insights'
+]
+
+# One record per store, month and category
+RECORD_KEY = ['store_id', 'date', 'category']
+
+# Low-cardinality keys held as categoricals so groupbys hash integer codes
+CATEGORICAL_COLUMNS = ['chain_name', 'region', 'tier', 'category', 'store_id']
+
+# Aggregations shared by several analyses, computed once per grouping key
+CHAIN_METRICS = {
+    'sales_amount': ['sum', 'mean'],
+    'net_profit': ['sum'],
+    'net_margin_pct': ['mean'],
+    'customer_count': ['sum'],
+    'store_id': ['nunique'],
+    'customer_satisfaction_score': ['mean']
+}
+
+CATEGORY_METRICS = {
+    'sales_amount': 'sum',
+    'net_profit': 'sum',
+    'gross_margin_pct': 'mean',
+    'net_margin_pct': 'mean',
+    'customer_count': 'sum',
+    'inventory_turnover_ratio': 'mean'
+}
+
+REGION_METRICS = {
+    'sales_amount': 'sum',
+    'net_profit': 'sum',
+    'store_id': 'nunique',
+    'customer_count': 'sum',
+    'net_margin_pct': 'mean'
+}
+
+TIER_METRICS = {
+    'sales_amount': ['sum', 'mean', 'std', 'count'],
+    'net_margin_pct': ['mean'],
+    'avg_basket_value': ['mean'],
+    'customer_satisfaction_score': ['mean']
+}
+
+MONTHLY_METRICS = {
+    'sales_amount': 'sum',
+    'net_profit': 'sum',
+    'customer_count': 'sum',
+    'date': 'first'
+}
+
+def _as_tuple(value):
+    return tuple(value) if isinstance(value, (list, tuple)) else (value,)
+
+def _pct(numerator, denominator):
+    """numerator / denominator * 100 computed in place, without a temporary per operator"""
+    result = np.divide(numerator.to_numpy(dtype=np.float64), np.asarray(denominator, dtype=np.float64))
+    result *= 100
+    return pd.Series(result, index=numerator.index)
+
+def _extremes(frame, column, n=5):
+    """Rows with the n largest and n smallest values of column, matching nlargest/nsmallest"""
+    values = frame[column].to_numpy(dtype=np.float64)
+    positions = np.flatnonzero(~np.isnan(values))
+    valid = values[positions]
+    n = min(n, len(valid))
+    if n == 0:
+        return frame.iloc[:0], frame.iloc[:0]
+
+    # np.partition finds both cutoff values in linear time. Every row at or beyond
+    # a cutoff, ties included, is a candidate, and candidates are lexsorted by
+    # (value, position) to keep the earliest like keep='first'. Heavy ties make
+    # that candidate sort approach O(N log N)
+    partitioned = np.partition(valid, [n - 1, len(valid) - n])
+    top = positions[valid >= partitioned[len(valid) - n]]
+    bottom = positions[valid <= partitioned[n - 1]]
+    top = top[np.lexsort((top, -values[top]))][:n]
+    bottom = bottom[np.lexsort((bottom, values[bottom]))][:n]
+    return frame.iloc[top], frame.iloc[bottom]
+
+def _cache_path(data_file):
+    """Parquet cache path for data_file, tagged with a fingerprint of the loaded schema"""
+    schema = repr((CACHE_VERSION, sorted(COLUMN_TYPES.items()), CATEGORICAL_COLUMNS))
+    fingerprint = hashlib.sha1(schema.encode()).hexdigest()[:10]
+    return f"{os.path.splitext(data_file)[0]}.{fingerprint}.parquet"
+
+def _store_lines(stores):
+    """Format store rows as report lines without iterating row by row"""
+    lines = ('   ' + stores['store_id'].astype(str) + ' (' + stores['chain_name'].astype(str) +
+             ', ' + stores['tier'].astype(str) + '): ' +
+             stores['profit_margin'].map('{:.1f}'.format) + '% margin')
+    return '\n'.join(lines)
+
+class _ThreadOutput(io.TextIOBase):
+    """stdout proxy that routes each worker thread's prints to its own buffer"""
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        return getattr(self._local, 'buffer', self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def capture(self, method):
+        """Call method, returning its result, everything it printed and any exception raised"""
+        self._local.buffer = io.StringIO()
+        try:
+            return method(), self._local.buffer.getvalue(), None
+        except Exception as error:
+            return None, self._local.buffer.getvalue(), error
+        finally:
+            del self._local.buffer
 
 class RetailAnalytics:
     def __init__(self, data_file):
-        """Initialize with retail data"""
-        self.data = pd.read_csv(data_file)
-        self.data['date'] = pd.to_datetime(self.data[['year', 'month']].assign(day=1))
+        """Initialize with retail data, reusing a Parquet copy newer than the CSV"""
+        cache_file = _cache_path(data_file)
+        self.data = self._read_cache(cache_file, data_file)
+        if self.data is None:
+            self.data = self._read_csv(data_file)
+            self._write_cache(self.data, cache_file)
+        self._gb = {}
+        self._totals = None
+        # Analyses run on worker threads; one lock per cache entry keeps each
+        # shared aggregation computed once without serialising unrelated ones
+        self._locks = {}
+        self._locks_guard = threading.Lock()
         print(f"Loaded {len(self.data):,} records for analysis")
 
+    @staticmethod
+    def _read_cache(cache_file, data_file):
+        """Cached frame if it is readable and newer than the CSV, otherwise None"""
+        try:
+            if os.path.isfile(cache_file) and os.path.getmtime(cache_file) > os.path.getmtime(data_file):
+                data = pd.read_parquet(cache_file, engine='pyarrow')
+                if list(data.columns) == list(COLUMN_TYPES) + ['date']:
+                    return data
+        except (OSError, ValueError, pa.ArrowException):
+            pass
+        return None
+
+    @staticmethod
+    def _write_cache(data, cache_file):
+        """Write the Parquet cache atomically; a failed write just means the next run parses the CSV"""
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            data.to_parquet(tmp_file, engine='pyarrow', compression='zstd', index=False)
+            os.replace(tmp_file, cache_file)
+        except (OSError, ValueError, pa.ArrowException):
+            with contextlib.suppress(OSError):
+                os.remove(tmp_file)
+            return
+
+        # Remove caches written under an older schema fingerprint
+        stem = cache_file.rsplit('.', 2)[0]
+        for stale_file in glob.glob(glob.escape(stem) + '.' + '[0-9a-f]' * 10 + '.parquet'):
+            if stale_file != cache_file:
+                with contextlib.suppress(OSError):
+                    os.remove(stale_file)
+
+    @staticmethod
+    def _read_csv(data_file):
+        """Parse the CSV and prepare typed columns for analysis"""
+        table = pacsv.read_csv(
+            data_file,
+            convert_options=pacsv.ConvertOptions(
+                column_types=COLUMN_TYPES,
+                include_columns=list(COLUMN_TYPES)
+            )
+        )
+        data = table.to_pandas()
+        for col in CATEGORICAL_COLUMNS:
+            data[col] = data[col].astype('category')
+        months = ((data['year'].to_numpy() - 1970).astype('datetime64[Y]') +
+                  (data['month'].to_numpy() - 1).astype('timedelta64[M]'))
+        data['date'] = months.astype('datetime64[ns]')
+        return data
+
+    def _group_agg(self, keys, metrics):
+        """Aggregate metrics by keys once and reuse the result across analyses"""
+        cache_key = (_as_tuple(keys),
+                     tuple((col, _as_tuple(funcs)) for col, funcs in metrics.items()))
+        with self._cache_lock(cache_key):
+            if cache_key not in self._gb:
+                result = self.data.groupby(keys, observed=True).agg(metrics)
+                # Ratio and score means come back float32; round them in float64 so
+                # two-decimal rounding matches the source values
+                self._gb[cache_key] = result.astype(
+                    {col: np.float64 for col, dtype in result.dtypes.items() if dtype == np.float32}
+                )
+            return self._gb[cache_key]
+
+    def _cache_lock(self, cache_key):
+        """Lock guarding the fill of one cache entry"""
+        with self._locks_guard:
+            return self._locks.setdefault(cache_key, threading.Lock())
+
+    def _overall_totals(self):
+        """Total revenue, total profit and average margin from a single array pass"""
+        with self._cache_lock('totals'):
+            if self._totals is None:
+                values = self.data[['sales_amount', 'net_profit', 'net_margin_pct']].to_numpy()
+                revenue, profit, _ = np.nansum(values, axis=0, dtype=np.float64)
+                self._totals = {
+                    'revenue': revenue,
+                    'profit': profit,
+                    'avg_margin': np.nanmean(values[:, 2], dtype=np.float64)
+                }
+            return self._totals
+
     def data_quality_check(self):
         """Comprehensive data quality assessment"""
         print("\n=== DATA QUALITY ASSESSMENT ===")
-        print(f"Dataset Shape: {self.data.shape}")
+        print(f"Dataset Shape (loaded columns): {self.data.shape}")
         print(f"Date Range: {self.data['date'].min()} to {self.data['date'].max()}")
-        print(f"Missing Values: {self.data.isnull().sum().sum()}")
-        print(f"Duplicate Records: {self.data.duplicated().sum()}")
+        print(f"Missing Values (loaded columns): {sum(self.data[col].isna().sum() for col in self.data.columns)}")
+        print(f"Duplicate Records: {len(self.data) - len(self.data[RECORD_KEY].drop_duplicates())}")
 
         # Business metrics validation
+        totals = self._overall_totals()
         print("\n--- Business Metrics Validation ---")
-        print(f"Total Revenue: ₹{self.data['sales_amount'].sum()/10000000:.1f} Crores")
-        print(f"Average Margin: {self.data['net_margin_pct'].mean():.2f}%")
+        print(f"Total Revenue: ₹{totals['revenue']/10000000:.1f} Crores")
+        print(f"Average Margin: {totals['avg_margin']:.2f}%")
         print(f"Stores Analyzed: {self.data['store_id'].nunique()}")
-        print(f"Time Periods: {len(self.data.groupby(['year', 'month']))}")
+        print(f"Time Periods: {len(self._group_agg(['year', 'month'], MONTHLY_METRICS))}")
 
     def financial_analysis(self):
         """Comprehensive financial performance analysis"""
         print("\n=== FINANCIAL PERFORMANCE ANALYSIS ===")
 
         # Overall performance metrics
-        total_revenue = self.data['sales_amount'].sum()
-        total_profit = self.data['net_profit'].sum()
-        avg_margin = self.data['net_margin_pct'].mean()
+        totals = self._overall_totals()
+        total_revenue = totals['revenue']
+        total_profit = totals['profit']
+        avg_margin = totals['avg_margin']
 
         print(f"\n📊 Overall Performance:")
         print(f"   Total Revenue: ₹{total_revenue/10000000:.1f} Crores")
@@ -57,13 +304,14 @@ class RetailAnalytics:
         print(f"   Average Margin: {avg_margin:.2f}%")
 
         # Chain-wise performance
-        chain_performance = self.data.groupby('chain_name').agg({
-            'sales_amount': ['sum', 'mean'],
-            'net_profit': 'sum',
-            'net_margin_pct': 'mean',
-            'customer_count': 'sum',
-            'store_id': 'nunique'
-        }).round(2)
+        chain_performance = self._group_agg('chain_name', CHAIN_METRICS)[[
+            ('sales_amount', 'sum'),
+            ('sales_amount', 'mean'),
+            ('net_profit', 'sum'),
+            ('net_margin_pct', 'mean'),
+            ('customer_count', 'sum'),
+            ('store_id', 'nunique')
+        ]].round(2)
 
         chain_performance.columns = ['Total_Sales', 'Avg_Sales', 'Total_Profit', 
                                    'Avg_Margin', 'Total_Customers', 'Store_Count']
@@ -72,9 +320,12 @@ class RetailAnalytics:
                                          chain_performance['Total_Customers']/100000).round(2)
 
         print(f"\n📈 Chain Performance Ranking:")
-        top_chains = chain_performance.sort_values('Avg_Margin', ascending=False)
-        for idx, (chain, metrics) in enumerate(top_chains.iterrows(), 1):
-            print(f"   {idx}. {chain}: {metrics['Sales_Crores']} Cr, {metrics['Avg_Margin']:.2f}% margin")
+        top_chains = chain_performance.nlargest(len(chain_performance), 'Avg_Margin')
+        rank = pd.Series(np.arange(1, len(top_chains) + 1), index=top_chains.index).astype(str)
+        lines = ('   ' + rank + '. ' + top_chains.index.astype(str) + ': ' +
+                 top_chains['Sales_Crores'].astype(str) + ' Cr, ' +
+                 top_chains['Avg_Margin'].map('{:.2f}'.format) + '% margin')
+        print('\n'.join(lines))
 
         return chain_performance
 
@@ -82,24 +333,21 @@ class RetailAnalytics:
         """Product category performance analysis"""
         print("\n=== CATEGORY PERFORMANCE ANALYSIS ===")
 
-        category_metrics = self.data.groupby('category').agg({
-            'sales_amount': 'sum',
-            'net_profit': 'sum',
-            'gross_margin_pct': 'mean',
-            'net_margin_pct': 'mean',
-            'customer_count': 'sum',
-            'inventory_turnover_ratio': 'mean'
-        }).round(2)
+        category_metrics = self._group_agg('category', CATEGORY_METRICS).round(2)
 
-        category_metrics['Sales_Share_%'] = (category_metrics['sales_amount'] / 
-                                           category_metrics['sales_amount'].sum() * 100).round(1)
-        category_metrics['Profit_Contribution'] = (category_metrics['net_profit'] / 
-                                                 category_metrics['net_profit'].sum() * 100).round(1)
+        category_metrics['Sales_Share_%'] = _pct(category_metrics['sales_amount'],
+                                                category_metrics['sales_amount'].sum()).round(1)
+        category_metrics['Profit_Contribution'] = _pct(category_metrics['net_profit'],
+                                                      category_metrics['net_profit'].sum()).round(1)
 
         print(f"\n📦 Category Performance:")
-        for category, metrics in category_metrics.iterrows():
-            profit_status = "✅" if metrics['net_margin_pct'] > 5 else "⚠️" if metrics['net_margin_pct'] > 0 else "❌"
-            print(f"   {profit_status} {category}: {metrics['Sales_Share_%']}% sales, {metrics['net_margin_pct']:.1f}% margin")
+        margin = category_metrics['net_margin_pct']
+        profit_status = pd.Series(np.select([margin > 5, margin > 0], ["✅", "⚠️"], default="❌"),
+                                  index=category_metrics.index)
+        lines = ('   ' + profit_status + ' ' + category_metrics.index.astype(str) + ': ' +
+                 category_metrics['Sales_Share_%'].astype(str) + '% sales, ' +
+                 margin.map('{:.1f}'.format) + '% margin')
+        print('\n'.join(lines))
 
         return category_metrics
 
@@ -108,33 +356,36 @@ class RetailAnalytics:
         print("\n=== REGIONAL PERFORMANCE ANALYSIS ===")
 
         # Region analysis
-        regional_metrics = self.data.groupby('region').agg({
-            'sales_amount': 'sum',
-            'net_profit': 'sum', 
-            'store_id': 'nunique',
-            'customer_count': 'sum'
-        }).round(0)
+        regional_metrics = self._group_agg('region', REGION_METRICS)[[
+            'sales_amount', 'net_profit', 'store_id', 'customer_count'
+        ]].round(0)
 
         regional_metrics['Sales_Per_Store'] = (regional_metrics['sales_amount'] / 
                                              regional_metrics['store_id']).round(0)
-        regional_metrics['Profit_Margin'] = (regional_metrics['net_profit'] / 
-                                           regional_metrics['sales_amount'] * 100).round(2)
+        regional_metrics['Profit_Margin'] = _pct(regional_metrics['net_profit'],
+                                                regional_metrics['sales_amount']).round(2)
 
         print(f"\n🗺️  Regional Performance:")
-        for region, metrics in regional_metrics.sort_values('sales_amount', ascending=False).iterrows():
-            print(f"   {region}: ₹{metrics['sales_amount']/10000000:.1f}Cr sales, {metrics['Profit_Margin']:.1f}% margin")
+        ranked_regions = regional_metrics.nlargest(len(regional_metrics), 'sales_amount')
+        lines = ('   ' + ranked_regions.index.astype(str) + ': ₹' +
+                 (ranked_regions['sales_amount'] / 10000000).map('{:.1f}'.format) + 'Cr sales, ' +
+                 ranked_regions['Profit_Margin'].map('{:.1f}'.format) + '% margin')
+        print('\n'.join(lines))
 
         # Tier analysis  
-        tier_analysis = self.data.groupby('tier').agg({
-            'sales_amount': 'sum',
-            'net_margin_pct': 'mean',
-            'avg_basket_value': 'mean',
-            'customer_satisfaction_score': 'mean'
-        }).round(2)
+        tier_analysis = self._group_agg('tier', TIER_METRICS)[[
+            ('sales_amount', 'sum'),
+            ('net_margin_pct', 'mean'),
+            ('avg_basket_value', 'mean'),
+            ('customer_satisfaction_score', 'mean')
+        ]].droplevel(1, axis=1).round(2)
 
         print(f"\n🏢 City Tier Analysis:")
-        for tier, metrics in tier_analysis.iterrows():
-            print(f"   {tier}: ₹{metrics['avg_basket_value']} basket, {metrics['net_margin_pct']:.1f}% margin, {metrics['customer_satisfaction_score']:.1f}/5 satisfaction")
+        lines = ('   ' + tier_analysis.index.astype(str) + ': ₹' +
+                 tier_analysis['avg_basket_value'].astype(str) + ' basket, ' +
+                 tier_analysis['net_margin_pct'].map('{:.1f}'.format) + '% margin, ' +
+                 tier_analysis['customer_satisfaction_score'].map('{:.1f}'.format) + '/5 satisfaction')
+        print('\n'.join(lines))
 
         return regional_metrics, tier_analysis
 
@@ -143,14 +394,10 @@ class RetailAnalytics:
         print("\n=== TIME SERIES ANALYSIS ===")
 
         # Monthly trends
-        monthly_trends = self.data.groupby(['year', 'month']).agg({
-            'sales_amount': 'sum',
-            'net_profit': 'sum',
-            'customer_count': 'sum'
-        }).reset_index()
+        monthly_trends = self._group_agg(['year', 'month'], MONTHLY_METRICS).reset_index()
 
-        monthly_trends['month_year'] = monthly_trends['year'].astype(str) + '-' + monthly_trends['month'].astype(str).str.zfill(2)
-        monthly_trends['profit_margin'] = (monthly_trends['net_profit'] / monthly_trends['sales_amount'] * 100).round(2)
+        monthly_trends['month_year'] = monthly_trends['date'].dt.strftime('%Y-%m')
+        monthly_trends['profit_margin'] = _pct(monthly_trends['net_profit'], monthly_trends['sales_amount']).round(2)
 
         # Calculate growth rates
         monthly_trends['sales_growth'] = monthly_trends['sales_amount'].pct_change() * 100
@@ -158,9 +405,13 @@ class RetailAnalytics:
 
         print(f"\n📅 Recent Performance (Last 6 months):")
         recent_data = monthly_trends.tail(6)
-        for _, row in recent_data.iterrows():
-            growth_indicator = "📈" if row['sales_growth'] > 0 else "📉" if row['sales_growth'] < -5 else "📊"
-            print(f"   {growth_indicator} {row['month_year']}: ₹{row['sales_amount']/1000000:.1f}M sales ({row['sales_growth']:.1f}% growth)")
+        growth = recent_data['sales_growth']
+        growth_indicator = pd.Series(np.select([growth > 0, growth < -5], ["📈", "📉"], default="📊"),
+                                     index=recent_data.index)
+        lines = ('   ' + growth_indicator + ' ' + recent_data['month_year'] + ': ₹' +
+                 (recent_data['sales_amount'] / 1000000).map('{:.1f}'.format) + 'M sales (' +
+                 growth.map('{:.1f}'.format) + '% growth)')
+        print('\n'.join(lines))
 
         # Seasonal analysis
         seasonal_performance = self.data.groupby('month')['sales_amount'].mean()
@@ -178,31 +429,33 @@ class RetailAnalytics:
         print("\n=== OPERATIONAL ANALYSIS ===")
 
         # Efficiency metrics by store
-        store_efficiency = self.data.groupby(['store_id', 'chain_name', 'tier']).agg({
+        # chain_name and tier are fixed per store, so group on store_id alone
+        # and attach them from a per-store lookup
+        store_meta = self.data[['store_id', 'chain_name', 'tier']].drop_duplicates('store_id').set_index('store_id')
+        store_metrics = self.data.groupby('store_id', observed=True).agg({
             'sales_amount': 'sum',
-            'net_profit': 'sum', 
+            'net_profit': 'sum',
             'customer_count': 'sum',
             'total_items_sold': 'sum',
             'inventory_turnover_ratio': 'mean',
             'customer_satisfaction_score': 'mean'
-        }).reset_index()
+        })
+        store_efficiency = pd.concat([store_meta.reindex(store_metrics.index), store_metrics], axis=1).reset_index()
 
         store_efficiency['sales_per_customer'] = (store_efficiency['sales_amount'] / 
                                                 store_efficiency['customer_count']).round(0)
-        store_efficiency['profit_margin'] = (store_efficiency['net_profit'] / 
-                                           store_efficiency['sales_amount'] * 100).round(2)
+        store_efficiency['profit_margin'] = _pct(store_efficiency['net_profit'],
+                                                store_efficiency['sales_amount']).round(2)
+
+        top_stores, bottom_stores = _extremes(store_efficiency, 'profit_margin')
 
         # Top performers
-        top_stores = store_efficiency.nlargest(5, 'profit_margin')
         print(f"\n🏆 Top Performing Stores:")
-        for _, store in top_stores.iterrows():
-            print(f"   {store['store_id']} ({store['chain_name']}, {store['tier']}): {store['profit_margin']:.1f}% margin")
+        print(_store_lines(top_stores))
 
         # Bottom performers
-        bottom_stores = store_efficiency.nsmallest(5, 'profit_margin')
         print(f"\n⚠️  Stores Needing Attention:")
-        for _, store in bottom_stores.iterrows():
-            print(f"   {store['store_id']} ({store['chain_name']}, {store['tier']}): {store['profit_margin']:.1f}% margin")
+        print(_store_lines(bottom_stores))
 
         return store_efficiency
 
@@ -214,25 +467,34 @@ class RetailAnalytics:
         numeric_cols = ['sales_amount', 'gross_margin_pct', 'customer_count', 
                        'avg_basket_value', 'inventory_turnover_ratio', 'customer_satisfaction_score']
 
-        correlation_matrix = self.data[numeric_cols].corr()
+        values = np.ascontiguousarray(self.data[numeric_cols].to_numpy(dtype=np.float64))
+        if np.isnan(values).any():
+            # np.corrcoef would spread NaN; pandas uses pairwise-complete observations
+            correlation_matrix = self.data[numeric_cols].corr()
+        else:
+            correlation_matrix = pd.DataFrame(np.corrcoef(values, rowvar=False),
+                                              index=numeric_cols, columns=numeric_cols)
+        corr = correlation_matrix.to_numpy()
 
         print(f"\n🔢 Key Correlations:")
         high_corr = []
-        for i in range(len(correlation_matrix.columns)):
-            for j in range(i+1, len(correlation_matrix.columns)):
-                corr_val = correlation_matrix.iloc[i, j]
-                if abs(corr_val) > 0.5:  # Strong correlation
-                    var1 = correlation_matrix.columns[i]
-                    var2 = correlation_matrix.columns[j]
-                    direction = "positive" if corr_val > 0 else "negative"
-                    print(f"   • {var1} & {var2}: {direction} correlation ({corr_val:.2f})")
-                    high_corr.append((var1, var2, corr_val))
-
-        # Statistical tests
-        metro_sales = self.data[self.data['tier'] == 'Metro']['sales_amount']
-        tier1_sales = self.data[self.data['tier'] == 'Tier_1']['sales_amount']
-
-        t_stat, p_value = stats.ttest_ind(metro_sales, tier1_sales)
+        # Strong correlations in the upper triangle, excluding the diagonal
+        for i, j in zip(*np.where(np.triu(np.abs(corr) > 0.5, k=1))):
+            corr_val = corr[i, j]
+            var1, var2 = numeric_cols[i], numeric_cols[j]
+            direction = "positive" if corr_val > 0 else "negative"
+            print(f"   • {var1} & {var2}: {direction} correlation ({corr_val:.2f})")
+            high_corr.append((var1, var2, corr_val))
+
+        # Statistical tests (Welch's t-test from the shared per-tier moments)
+        tier_sales = self._group_agg('tier', TIER_METRICS)['sales_amount']
+        metro, tier1 = tier_sales.loc['Metro'], tier_sales.loc['Tier_1']
+
+        t_stat, p_value = stats.ttest_ind_from_stats(
+            metro['mean'], metro['std'], metro['count'],
+            tier1['mean'], tier1['std'], tier1['count'],
+            equal_var=False
+        )
 
         print(f"\n📊 Statistical Test Results:")
         print(f"   Metro vs Tier-1 Sales Difference: {'Significant' if p_value < 0.05 else 'Not Significant'} (p={p_value:.4f})")
@@ -243,71 +505,62 @@ class RetailAnalytics:
         """Create comprehensive visualizations"""
         print("\n=== GENERATING VISUALIZATIONS ===")
 
+        # Plotting libraries and style are only set up when charts are requested
+        import seaborn as sns
+
         # Set up the plotting style
+        plt.style.use('seaborn-v0_8')
         plt.rcParams['figure.figsize'] = (12, 8)
         plt.rcParams['font.size'] = 10
 
         # 1. Chain Performance Comparison
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
 
-        chain_metrics = self.data.groupby('chain_name').agg({
-            'sales_amount': 'sum',
-            'net_margin_pct': 'mean',
-            'customer_count': 'sum',
-            'customer_satisfaction_score': 'mean'
-        })
+        chain_metrics = self._group_agg('chain_name', CHAIN_METRICS)
 
         # Sales by chain
-        chain_metrics['sales_amount'].plot(kind='bar', ax=ax1, color='skyblue')
+        chain_metrics[('sales_amount', 'sum')].plot(kind='bar', ax=ax1, color='skyblue')
         ax1.set_title('Total Sales by Chain')
         ax1.set_ylabel('Sales (₹)')
         ax1.tick_params(axis='x', rotation=45)
 
         # Margin by chain
-        chain_metrics['net_margin_pct'].plot(kind='bar', ax=ax2, color='lightgreen')
+        chain_metrics[('net_margin_pct', 'mean')].plot(kind='bar', ax=ax2, color='lightgreen')
         ax2.set_title('Average Profit Margin by Chain')
         ax2.set_ylabel('Margin (%)')
         ax2.tick_params(axis='x', rotation=45)
 
         # Customer count
-        chain_metrics['customer_count'].plot(kind='bar', ax=ax3, color='orange')
+        chain_metrics[('customer_count', 'sum')].plot(kind='bar', ax=ax3, color='orange')
         ax3.set_title('Total Customers by Chain')
         ax3.set_ylabel('Customer Count')
         ax3.tick_params(axis='x', rotation=45)
 
         # Satisfaction scores
-        chain_metrics['customer_satisfaction_score'].plot(kind='bar', ax=ax4, color='pink')
+        chain_metrics[('customer_satisfaction_score', 'mean')].plot(kind='bar', ax=ax4, color='pink')
         ax4.set_title('Customer Satisfaction by Chain')
         ax4.set_ylabel('Satisfaction Score (1-5)')
         ax4.tick_params(axis='x', rotation=45)
 
         plt.tight_layout()
-        plt.savefig('chain_performance_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig('chain_performance_analysis.png', dpi=150, bbox_inches='tight', pil_kwargs={'optimize': True})
+        plt.close('all')
 
         # 2. Category Performance Heatmap
         plt.figure(figsize=(12, 8))
-        category_pivot = self.data.pivot_table(
-            values='net_margin_pct', 
-            index='category', 
-            columns='chain_name', 
-            aggfunc='mean'
-        )
+        category_pivot = self.data.groupby(
+            ['category', 'chain_name'], observed=True
+        )['net_margin_pct'].mean().unstack('chain_name')
 
         sns.heatmap(category_pivot, annot=True, fmt='.1f', cmap='RdYlGn', center=0)
         plt.title('Profit Margin by Category and Chain')
         plt.tight_layout()
-        plt.savefig('category_margin_heatmap.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig('category_margin_heatmap.png', dpi=150, bbox_inches='tight', pil_kwargs={'optimize': True})
+        plt.close('all')
 
         # 3. Time Series Trends
         plt.figure(figsize=(14, 8))
-        monthly_data = self.data.groupby(['year', 'month']).agg({
-            'sales_amount': 'sum',
-            'net_profit': 'sum'
-        }).reset_index()
-
-        monthly_data['date'] = pd.to_datetime(monthly_data[['year', 'month']].assign(day=1))
+        monthly_data = self._group_agg(['year', 'month'], MONTHLY_METRICS).reset_index()
 
         fig, ax1 = plt.subplots(figsize=(14, 8))
 
@@ -326,8 +579,8 @@ class RetailAnalytics:
         plt.title('Monthly Sales and Profit Trends')
         plt.grid(True, alpha=0.3)
         fig.tight_layout()
-        plt.savefig('monthly_trends.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig('monthly_trends.png', dpi=150, bbox_inches='tight', pil_kwargs={'optimize': True})
+        plt.close('all')
 
         print("✅ Visualizations saved: chain_performance_analysis.png, category_margin_heatmap.png, monthly_trends.png")
 
@@ -335,13 +588,14 @@ class RetailAnalytics:
         """Generate comprehensive business summary"""
         print("\n=== EXECUTIVE SUMMARY ===")
 
-        total_revenue = self.data['sales_amount'].sum()
-        total_profit = self.data['net_profit'].sum()
+        totals = self._overall_totals()
+        total_revenue = totals['revenue']
+        total_profit = totals['profit']
         overall_margin = (total_profit / total_revenue) * 100
 
-        best_chain = self.data.groupby('chain_name')['net_margin_pct'].mean().idxmax()
-        best_category = self.data.groupby('category')['net_margin_pct'].mean().idxmax()
-        best_region = self.data.groupby('region')['net_margin_pct'].mean().idxmax()
+        best_chain = self._group_agg('chain_name', CHAIN_METRICS)[('net_margin_pct', 'mean')].idxmax()
+        best_category = self._group_agg('category', CATEGORY_METRICS)['net_margin_pct'].idxmax()
+        best_region = self._group_agg('region', REGION_METRICS)['net_margin_pct'].idxmax()
 
         print(f"""
 📊 RETAIL PERFORMANCE EXECUTIVE SUMMARY
@@ -375,8 +629,33 @@ Analysis completed by: Ayush Singhal
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """)
 
-def main():
-    """Main analysis execution"""
+def run_analyses(analyzer, names=ANALYSES, max_workers=1):
+    """Run independent analyses, optionally on a thread pool, printing their output in order"""
+    if max_workers == 1:
+        return {name: getattr(analyzer, name)() for name in names}
+
+    output = _ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {name: executor.submit(output.capture, getattr(analyzer, name)) for name in names}
+    finally:
+        sys.stdout = output.stream
+
+    # Flush every analysis' output, including any partial output before a
+    # failure, then surface the first error
+    results, errors = {}, []
+    for name, future in futures.items():
+        results[name], text, error = future.result()
+        sys.stdout.write(text)
+        if error is not None:
+            errors.append(error)
+    if errors:
+        raise errors[0]
+    return results
+
+def main(max_workers=1):
+    """Main analysis execution; max_workers > 1 runs the analyses on a thread pool"""
     print("🏪 INDIAN RETAIL CHAIN PERFORMANCE ANALYSIS")
     print("👤 Author: Ayush Singhal")
     print("📅 Analysis Date:", datetime.now().strftime('%Y-%m-%d'))
@@ -385,13 +664,13 @@ def main():
     analyzer = RetailAnalytics('indian_retail_complete.csv')
 
     # Run comprehensive analysis
-    analyzer.data_quality_check()
-    chain_perf = analyzer.financial_analysis()
-    category_perf = analyzer.category_analysis()  
-    regional_perf, tier_perf = analyzer.regional_analysis()
-    monthly_trends = analyzer.time_series_analysis()
-    store_efficiency = analyzer.operational_analysis()
-    correlations = analyzer.statistical_insights()
+    results = run_analyses(analyzer, max_workers=max_workers)
+    chain_perf = results['financial_analysis']
+    category_perf = results['category_analysis']
+    regional_perf, tier_perf = results['regional_analysis']
+    monthly_trends = results['time_series_analysis']
+    store_efficiency = results['operational_analysis']
+    correlations = results['statistical_insights']
 
     # Generate visualizations
     analyzer.generate_visualizations()